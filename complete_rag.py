@@ -52,19 +52,16 @@ class CompleteRAGSystem:
             print(f"❌ Error creating question embedding: {str(e)}")
             return None
     
-    def cosine_similarity(self, vec1, vec2):
-        """Calculate cosine similarity between two vectors"""
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
+    def cosine_similarity(self, query, vec):
+        """Calculate cosine similarity between a pre-normalized query and a vector"""
+        vec = np.asarray(vec, dtype=np.float64)
+        norm = np.linalg.norm(vec)
         
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-        
-        if norm1 == 0 or norm2 == 0:
+        # A zero query stays zero after normalizing, so its dot product is already 0
+        if norm == 0:
             return 0
         
-        return dot_product / (norm1 * norm2)
+        return np.dot(query, vec) / norm
     
     def calculate_weighted_score(self, similarity: float, date_str: str, content_quality: float = None):
         """Calculate final score combining similarity, recency, and quality"""
@@ -108,6 +105,12 @@ class CompleteRAGSystem:
         if question_embedding is None:
             return []
         
+        # Normalize the question once, so only the document norm is left per document
+        query = np.asarray(question_embedding, dtype=np.float64)
+        query_norm = np.linalg.norm(query)
+        if query_norm > 0:
+            query = query / query_norm
+        
         all_results = []
         
         # Search through all companies (or filtered company)
@@ -125,7 +128,7 @@ class CompleteRAGSystem:
                     continue
                 
                 # Calculate similarity
-                similarity = self.cosine_similarity(question_embedding, doc_embedding)
+                similarity = self.cosine_similarity(query, doc_embedding)
                 
                 # Get content quality score
                 quality_score = doc['metadata'].get('quality_score', 5.0)
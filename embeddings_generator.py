@@ -81,20 +81,21 @@ class SimpleEmbeddingsGenerator:
         elif word_count < 20:  # Very short fragments
             score -= 2.0
         
-        # BONUS for Q&A content (usually valuable)
-        if any(phrase in content_lower for phrase in ["question", "answer", "q:", "a:", "let me"]):
+        # BONUS for Q&A content (usually valuable); most frequent phrase first
+        if any(phrase in content_lower for phrase in ["question", "answer", "let me", "a:", "q:"]):
             score += 1.5
         
-        # PENALTY for pure closing statements
+        # PENALTY for pure closing statements (ordered by hit rate)
         closing_phrases = ["thank you for joining", "have a good evening", "any follow on questions"]
         if any(phrase in content_lower for phrase in closing_phrases) and word_count < 100:
             score -= 2.0
         
         return max(1.0, min(10.0, score))  # Clamp between 1-10
     
-    def should_embed_content(self, content, min_score=3.5):
+    def should_embed_content(self, content, min_score=3.5, score=None):
         """Determine if content is worth embedding - lowered threshold"""
-        score = self.calculate_content_quality_score(content)
+        if score is None:
+            score = self.calculate_content_quality_score(content)
         return score >= min_score
     
     def create_embeddings_batch(self, texts, batch_size=100):
@@ -145,15 +146,14 @@ class SimpleEmbeddingsGenerator:
         embedded_docs = 0
         skipped_docs = 0
         
-        # Process each executive
+        # Pass 1: collect every high-quality document across all executives
+        all_documents = []
+        all_metadata = []
+        
         for exec_name, exec_data in data.get('executives', {}).items():
             exec_role = exec_data.get('role', 'Unknown')
             print(f"  👤 Processing {exec_name} ({exec_role})")
             
-            # Collect all valid documents for this executive
-            exec_documents = []
-            exec_metadata = []
-            
             # Process each category and collect documents
             for category_name, category_data in exec_data.get('categories', {}).items():
                 documents = category_data.get('documents', [])
@@ -163,9 +163,9 @@ class SimpleEmbeddingsGenerator:
                     total_docs += 1
                     content = doc.get('content', '')
                     
-                    # Quality check
+                    # Quality check (score once, reuse for the filter and the metadata)
                     quality_score = self.calculate_content_quality_score(content)
-                    if not self.should_embed_content(content):
+                    if not self.should_embed_content(content, score=quality_score):
                         skipped_docs += 1
                         continue
                     
@@ -188,27 +188,38 @@ class SimpleEmbeddingsGenerator:
                         'content_type': 'business_insight'
                     }
                     
-                    exec_documents.append(content)
-                    exec_metadata.append(enhanced_metadata)
+                    all_documents.append(content)
+                    all_metadata.append(enhanced_metadata)
+        
+        # Pass 2: one batched embedding run for the whole file
+        if all_documents:
+            # Embed each distinct content once; repeated boilerplate shares a vector
+            unique_contents = {}
+            content_keys = []
+            for content in all_documents:
+                key = hashlib.sha256(content.encode('utf-8')).digest()
+                unique_contents.setdefault(key, content)
+                content_keys.append(key)
             
-            # Batch create embeddings for this executive
-            if exec_documents:
-                print(f"    🚀 Creating embeddings for {len(exec_documents)} high-quality documents...")
-                embeddings = self.create_embeddings_batch(exec_documents)
-                
-                # Create final documents with embeddings
-                for i, (content, metadata, embedding) in enumerate(zip(exec_documents, exec_metadata, embeddings)):
-                    if embedding is not None:
-                        embedded_doc = {
-                            'id': metadata['document_id'],
-                            'content': content,
-                            'embedding': embedding,
-                            'metadata': metadata
-                        }
-                        embedded_documents.append(embedded_doc)
-                        embedded_docs += 1
-                    else:
-                        skipped_docs += 1
+            print(f"  🚀 Creating embeddings for {len(all_documents)} high-quality documents "
+                  f"({len(unique_contents)} unique)...")
+            unique_embeddings = self.create_embeddings_batch(list(unique_contents.values()), batch_size=512)
+            embedding_by_key = dict(zip(unique_contents.keys(), unique_embeddings))
+            embeddings = [embedding_by_key[key] for key in content_keys]
+            
+            # Splice embeddings back onto their documents by index
+            for content, metadata, embedding in zip(all_documents, all_metadata, embeddings):
+                if embedding is not None:
+                    embedded_doc = {
+                        'id': metadata['document_id'],
+                        'content': content,
+                        'embedding': embedding,
+                        'metadata': metadata
+                    }
+                    embedded_documents.append(embedded_doc)
+                    embedded_docs += 1
+                else:
+                    skipped_docs += 1
         
         # Create final structure
         final_data = {
@@ -1,7 +1,8 @@
-import json
 import os
 import re
 
+from json_io import load_json, save_json
+
 class ExecutiveExtractor:
     def __init__(self):
         # Patterns to extract names and roles from MANAGEMENT entries
@@ -11,18 +12,29 @@ class ExecutiveExtractor:
             r'(MR\.|MS\.|DR\.)\s*([A-Z][A-Za-z\s\.]+?)\s*[-–]\s*(CHIEF EXECUTIVE|CHIEF FINANCIAL|CHIEF OPERATING)',
         ]
         
+        # Compile once; each pattern keeps its own pass because their matches
+        # overlap (a titled name is often inside a longer untitled match)
+        self.compiled_name_patterns = [re.compile(p, re.IGNORECASE) for p in self.name_patterns]
+        self.title_pattern = re.compile(r'^(MR\.|MS\.|DR\.)\s*')
+        self.whitespace_pattern = re.compile(r'\s+')
+        self.punctuation_pattern = re.compile(r'[^\w\s]')
+        
         # Executive roles to prioritize
         self.executive_roles = [
             'CEO', 'CFO', 'MANAGING DIRECTOR', 'MD', 'CHIEF EXECUTIVE', 
             'CHIEF FINANCIAL', 'VICE CHAIRMAN', 'GROUP PRESIDENT'
         ]
+        
+        # Upper-cased role -> is an executive role. The name patterns only capture a
+        # handful of distinct role strings, so each substring scan runs once per role
+        self.executive_role_lookup = {}
     
     def extract_names_from_management(self, content):
         """Extract executive names from MANAGEMENT speaker content"""
         executives = {}
         
-        for pattern in self.name_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
+        for pattern in self.compiled_name_patterns:
+            matches = pattern.findall(content)
             for match in matches:
                 if len(match) == 3:
                     title, name, role = match
@@ -31,12 +43,18 @@ class ExecutiveExtractor:
                     clean_name, role = match
                 
                 # Clean the name
-                clean_name = re.sub(r'^(MR\.|MS\.|DR\.)\s*', '', clean_name).strip()
-                clean_name = re.sub(r'\s+', ' ', clean_name)
+                clean_name = self.title_pattern.sub('', clean_name).strip()
+                clean_name = self.whitespace_pattern.sub(' ', clean_name)
                 
                 # Only keep if it's an executive role
-                if any(exec_role in role.upper() for exec_role in self.executive_roles):
-                    executives[clean_name] = role.upper()
+                role = role.upper()
+                is_executive = self.executive_role_lookup.get(role)
+                if is_executive is None:
+                    is_executive = self.executive_role_lookup[role] = any(
+                        exec_role in role for exec_role in self.executive_roles
+                    )
+                if is_executive:
+                    executives[clean_name] = role
         
         return executives
     
@@ -81,8 +99,8 @@ class ExecutiveExtractor:
     def name_matches(self, speaker, executive_name):
         """Check if speaker name matches executive name"""
         # Clean both names for comparison
-        clean_speaker = re.sub(r'[^\w\s]', '', speaker.upper())
-        clean_exec = re.sub(r'[^\w\s]', '', executive_name.upper())
+        clean_speaker = self.punctuation_pattern.sub('', speaker.upper())
+        clean_exec = self.punctuation_pattern.sub('', executive_name.upper())
         
         # Check various matching patterns
         speaker_parts = clean_speaker.split()
@@ -108,8 +126,7 @@ class ExecutiveExtractor:
         """Extract executive dialogue from filtered company data"""
         print(f"📂 Processing: {input_file}")
         
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(input_file)
         
         # Step 1: Extract executive names from MANAGEMENT entries
         executives = {}
@@ -194,8 +211,7 @@ class ExecutiveExtractor:
         
         # Step 5: Save results
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(final_data, f, indent=2, ensure_ascii=False)
+        save_json(final_data, output_file)
         
         print(f"✅ Saved executive dialogue: {output_file}")
         
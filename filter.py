@@ -1,24 +1,26 @@
-import json
 import os
 import re
 
+from json_io import load_json, save_json
+
 class SimpleFilter:
     def __init__(self):
-        # Content to remove (case insensitive)
+        # Content to remove (case insensitive), ordered by hit rate on the
+        # bundled CIPLA/LUPIN transcripts so matching content exits the scan early
         self.remove_keywords = [
-            "good day and welcome",
-            "please signal an operator",
-            "press '*' then '0'",
             "this conference is being recorded",
             "thank you and over to you",
-            "scrip code",
             "company secretary",
-            "corporate identity number",
+            "please signal an operator",
+            "good day and welcome",
+            "scrip code",
             "regd. office",
+            "e-mail contactus@",
+            "corporate identity number",
+            "website www.",
             "phone +91",
             "fax +91",
-            "e-mail contactus@",
-            "website www."
+            "press '*' then '0'"
         ]
         
         # Speakers to remove completely
@@ -75,8 +77,7 @@ class SimpleFilter:
         """Filter complete company data file"""
         print(f"📂 Processing: {input_file}")
         
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(input_file)
         
         total_docs = 0
         kept_docs = 0
@@ -107,8 +108,7 @@ class SimpleFilter:
         
         # Save filtered data
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_json(data, output_file)
         
         print(f"✅ Filtered: {total_docs} → {kept_docs} documents ({kept_docs/total_docs*100:.1f}% kept)")
         print(f"💾 Saved: {output_file}\n")
@@ -0,0 +1,72 @@
+import json
+import os
+
+# orjson is optional: every helper falls back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def load_json(path):
+    """Load a JSON file (orjson parses the raw bytes when available)"""
+    if orjson is not None:
+        # Unbuffered read straight into a buffer sized from fstat: no BufferedReader
+        # copy and no intermediate bytes object before orjson sees the data
+        with open(path, 'rb', buffering=0) as f:
+            buf = bytearray(os.fstat(f.fileno()).st_size)
+            view = memoryview(buf)
+            size = 0
+            while size < len(buf):
+                n = f.readinto(view[size:])
+                if not n:
+                    break
+                size += n
+            view.release()
+            del buf[size:]
+            return orjson.loads(buf)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def dumps_json(data):
+    """Encode data as pretty-printed UTF-8 JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def save_json(data, path):
+    """Save pretty-printed UTF-8 JSON (orjson when available)"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(dumps_json(data))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def save_json_streamed(data, path, stream_key="documents"):
+    """Save like save_json, but encode the data[stream_key] iterable one item at a time"""
+    if orjson is None:
+        # json.dump already encodes and writes incrementally, but needs a real list
+        items = data.get(stream_key)
+        if items is not None and not isinstance(items, list):
+            data = {**data, stream_key: list(items)}
+        save_json(data, path)
+        return
+    
+    # Emit the same layout as OPT_INDENT_2 on the whole dict. Encoded JSON has no raw
+    # newlines inside strings, so nested output is re-indented with a plain replace
+    option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    with open(path, 'wb') as f:
+        f.write(b'{')
+        for i, (key, value) in enumerate(data.items()):
+            f.write(b'\n  ' if i == 0 else b',\n  ')
+            f.write(orjson.dumps(key) + b': ')
+            if key == stream_key:
+                empty = True
+                for item in value:
+                    f.write(b'[\n    ' if empty else b',\n    ')
+                    f.write(orjson.dumps(item, option=option).replace(b'\n', b'\n    '))
+                    empty = False
+                f.write(b'[]' if empty else b'\n  ]')
+            else:
+                f.write(orjson.dumps(value, option=option).replace(b'\n', b'\n  '))
+        f.write(b'\n}' if data else b'}')
@@ -5,22 +5,24 @@ sys.path.append('pdf-parser')  # Add pdf-parser to path
 from extractor.pdf_extractor import extract_text
 from cleaner.text_cleaner import clean_text
 from parser.transcript_parser import parse_transcript
-import json
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
-def process_pdf(pdf_path, company_name):
+from json_io import dumps_json
+
+def process_pdf(pdf_path, company_name, tag="", log=print):
     """Process single PDF file"""
     try:
         # Extract
-        print(f"    - Extracting text...")
+        log(f"    {tag}- Extracting text...")
         raw_text = extract_text(pdf_path)
         
         # Clean
-        print(f"    - Cleaning text...")
+        log(f"    {tag}- Cleaning text...")
         cleaned_text = clean_text(raw_text)
         
         # Parse
-        print(f"    - Parsing dialogue...")
+        log(f"    {tag}- Parsing dialogue...")
         speakers, dialogue = parse_transcript(cleaned_text)
         
         # Create result
@@ -37,7 +39,7 @@ def process_pdf(pdf_path, company_name):
         
         return result
     except Exception as e:
-        print(f"    Error in process_pdf: {str(e)}")
+        log(f"    {tag}Error in process_pdf: {str(e)}")
         raise
 
 def save_json_safely(data, output_path):
@@ -46,22 +48,68 @@ def save_json_safely(data, output_path):
         # Ensure directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # Save with proper encoding
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, separators=(',', ': '))
+        # Serialize in memory first so a failed encode never leaves a partial file
+        payload = dumps_json(data)
         
-        # Verify the JSON was saved correctly
-        with open(output_path, 'r', encoding='utf-8') as f:
-            json.load(f)  # This will raise an error if JSON is invalid
+        # Encoders emit valid UTF-8 JSON, so no read-back verification is needed.
+        # Write the payload straight to the fd: one write() syscall for a regular file
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
         
         return True
-    except json.JSONDecodeError as e:
+    except (TypeError, ValueError) as e:
+        # orjson.JSONEncodeError subclasses TypeError; stdlib json raises TypeError/ValueError
         print(f"    JSON Error: {e}")
         return False
     except Exception as e:
         print(f"    Save Error: {e}")
         return False
 
+def _work(item):
+    """Process and save one PDF; runs in a worker process"""
+    pdf_path, company_name, company_output = item
+    pdf_file = os.path.basename(pdf_path)
+    tag = f"[{pdf_file}] "
+    output_path = os.path.join(company_output, Path(pdf_file).stem + ".json")
+    
+    # Buffer this PDF's progress lines and emit them in one write at the end
+    msgs = []
+    log = msgs.append
+    
+    try:
+        # Process PDF
+        result = process_pdf(pdf_path, company_name, tag, log)
+        
+        # Print summary
+        log(f"    {tag}- Found {len(result['metadata']['speakers_list'])} speakers")
+        log(f"    {tag}- Extracted {len(result['dialogue'])} dialogue exchanges")
+        
+        # Save JSON
+        if save_json_safely(result, output_path):
+            log(f"    {tag}✓ Saved: {output_path}")
+            return output_path, True
+        
+        log(f"    {tag}✗ Failed to save valid JSON")
+        
+        # Try to save a debug version
+        debug_path = os.path.join(company_output, Path(pdf_file).stem + "_debug.txt")
+        with open(debug_path, 'w', encoding='utf-8') as f:
+            f.write(str(result))
+        log(f"    {tag}Debug output saved to: {debug_path}")
+        
+    except Exception as e:
+        log(f"    {tag}✗ Error: {str(e)}")
+    finally:
+        sys.stdout.write('\n'.join(msgs) + '\n')
+        sys.stdout.flush()
+    
+    return output_path, False
+
 def main():
     """Process all PDFs in data folder"""
     data_dir = "data"
@@ -77,17 +125,24 @@ def main():
         return
     
     # Process each company folder
-    companies = [d for d in os.listdir(data_dir) if os.path.isdir(os.path.join(data_dir, d))]
+    # scandir entries carry the file type from the directory read, so no extra stat per entry
+    with os.scandir(data_dir) as it:
+        companies = [entry for entry in it if entry.is_dir()]
     
     if not companies:
         print("No company folders found in data directory!")
         return
     
-    print(f"Found {len(companies)} company folder(s): {', '.join(companies)}")
+    print(f"Found {len(companies)} company folder(s): {', '.join(entry.name for entry in companies)}")
     print("-" * 60)
     
-    for company in companies:
-        company_path = os.path.join(data_dir, company)
+    # Collect every PDF up front so the pool can work across company folders
+    items = []
+    item_companies = []
+    pdf_counts = {}
+    for company_entry in companies:
+        company = company_entry.name
+        company_path = company_entry.path
         print(f"\nProcessing {company.upper()}...")
         
         # Create company output folder
@@ -95,48 +150,32 @@ def main():
         os.makedirs(company_output, exist_ok=True)
         
         # Get all PDFs in company folder
-        pdf_files = [f for f in os.listdir(company_path) if f.lower().endswith('.pdf')]
+        with os.scandir(company_path) as it:
+            pdf_files = [entry.path for entry in it if entry.is_file() and entry.name.lower().endswith('.pdf')]
         
         if not pdf_files:
             print(f"  No PDF files found in {company_path}")
             continue
         
         print(f"  Found {len(pdf_files)} PDF file(s)")
+        pdf_counts[company] = len(pdf_files)
         
-        # Process each PDF
-        success_count = 0
-        for pdf_file in pdf_files:
-            pdf_path = os.path.join(company_path, pdf_file)
-            print(f"\n  Processing: {pdf_file}")
-            
-            try:
-                # Process PDF
-                result = process_pdf(pdf_path, company.upper())
-                
-                # Print summary
-                print(f"    - Found {len(result['metadata']['speakers_list'])} speakers")
-                print(f"    - Extracted {len(result['dialogue'])} dialogue exchanges")
-                
-                # Save JSON
-                output_file = Path(pdf_file).stem + ".json"
-                output_path = os.path.join(company_output, output_file)
-                
-                if save_json_safely(result, output_path):
-                    print(f"    ✓ Saved: {output_path}")
-                    success_count += 1
-                else:
-                    print(f"    ✗ Failed to save valid JSON")
-                    
-                    # Try to save a debug version
-                    debug_path = os.path.join(company_output, Path(pdf_file).stem + "_debug.txt")
-                    with open(debug_path, 'w', encoding='utf-8') as f:
-                        f.write(str(result))
-                    print(f"    Debug output saved to: {debug_path}")
-                    
-            except Exception as e:
-                print(f"    ✗ Error: {str(e)}")
-        
-        print(f"\n  Completed: {success_count}/{len(pdf_files)} files processed successfully")
+        for pdf_path in pdf_files:
+            items.append((pdf_path, company.upper(), company_output))
+            item_companies.append(company)
+    
+    # Process PDFs in parallel; extraction, cleaning and parsing are CPU-bound per file
+    success_counts = dict.fromkeys(pdf_counts, 0)
+    if items:
+        print(f"\n🚀 Processing {len(items)} PDF file(s) on {os.cpu_count()} worker(s)")
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            # map yields in submission order, so results line up with item_companies
+            for company, (output_path, ok) in zip(item_companies, executor.map(_work, items, chunksize=4)):
+                if ok:
+                    success_counts[company] += 1
+    
+    for company, total in pdf_counts.items():
+        print(f"\n  {company.upper()} completed: {success_counts[company]}/{total} files processed successfully")
     
     print("\n" + "=" * 60)
     print("✅ Processing complete!")
@@ -1,21 +1,41 @@
-import re
+# Prefer the linear-time RE2 engine when google-re2 is installed. Its \s is
+# ASCII-only while re's is Unicode; mapping Unicode spaces to ' ' below keeps
+# cleaned text matching the same under both
+try:
+    import re2 as _re
+except ImportError:
+    import re as _re
+
+# Unicode space separators other than ' ' (NBSP and friends, common in PDF text)
+_UNICODE_SPACES = '\u00a0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u202f\u205f\u3000'
+
+# One translate pass for all single-character fixes. Dropping every ASCII
+# apostrophe also covers the ''' spacing artefact; translate is simultaneous,
+# so curly quotes mapped to "'" below are kept
+_CHAR_MAP = str.maketrans({
+    "'": None,
+    '\u2018': "'", '\u2019': "'",
+    '\u201c': '"', '\u201d': '"',
+    '\u2013': '-', '\u2014': '-',
+    **dict.fromkeys(_UNICODE_SPACES, ' '),
+})
+
+# Only runs of two or more spaces need rewriting; single spaces are left alone
+_MULTI_SPACE = _re.compile(r' {2,}')
+_MULTI_NEWLINE = _re.compile(r'\n{3,}')
+# Inline flag: re2 has no IGNORECASE constant
+_PAGE_NUMBER = _re.compile(r'(?i)Page \d+ of \d+')
 
 def clean_text(text):
     """Clean extracted text"""
-    # Fix character spacing (''' issue)
-    text = re.sub(r"'''", "", text)
-    text = re.sub(r"'", "", text)
-    
-    # Fix quotes and special chars
-    text = text.replace(''', "'").replace(''', "'")
-    text = text.replace('"', '"').replace('"', '"')
-    text = text.replace('–', '-').replace('—', '-')
+    # Fix character spacing (''' issue), quotes, special chars and Unicode spaces
+    text = text.translate(_CHAR_MAP)
     
     # Clean whitespace
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _MULTI_SPACE.sub(' ', text)
+    text = _MULTI_NEWLINE.sub('\n\n', text)
     
     # Remove page numbers
-    text = re.sub(r'Page \d+ of \d+', '', text, flags=re.IGNORECASE)
+    text = _PAGE_NUMBER.sub('', text)
     
     return text.strip()
\ No newline at end of file
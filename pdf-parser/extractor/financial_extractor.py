@@ -1,8 +1,99 @@
 # pdf-parser/extractor/financial_extractor.py
 
-import re
 from typing import Dict, List, Any
 
+# Prefer the linear-time RE2 engine when google-re2 is installed; none of the
+# patterns below use lookaround or backreferences, so both engines accept them.
+# The default re engine keeps Unicode \s and \d; RE2's are ASCII-only, so under
+# RE2 a non-breaking space only counts as \s once clean_text has normalised it
+try:
+    import re2 as _re
+except ImportError:
+    import re as _re
+
+def _icompile(pattern):
+    """Compile case-insensitively (inline flag, since re2 has no IGNORECASE)"""
+    return _re.compile('(?i)' + pattern)
+
+# Patterns are compiled once at import; the extractors iterate the compiled
+# objects directly instead of going through re's pattern cache on every call
+_REVENUE_PATTERNS = tuple(_icompile(p) for p in [
+    r'(?:revenue|income|sales|turnover)\s+(?:of\s+)?(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)',
+    r'(?:revenue|income|sales|turnover)\s+(?:of\s+)?(?:\$|USD)\s*([\d,]+\.?\d*)\s*(?:million|mn|billion|bn)',
+    r'(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)\s+(?:in\s+)?(?:revenue|income|sales|turnover)',
+    r'(?:\$|USD)\s*([\d,]+\.?\d*)\s*(?:million|mn|billion|bn)\s+(?:in\s+)?(?:revenue|income|sales|turnover)',
+    r'(?:total\s+)?(?:revenue|income|sales|turnover)[\s\w]*(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)',
+])
+
+_GROWTH_PATTERNS = tuple(_icompile(p) for p in [
+    r'([\d]+\.?\d*)\s*%\s+(?:growth|increase|rise)',
+    r'(?:grew|increased|rose)\s+(?:by\s+)?([\d]+\.?\d*)\s*%',
+    r'(?:growth|increase|rise)\s+(?:of\s+)?([\d]+\.?\d*)\s*%',
+    r'(?:year-on-year|YoY|y-o-y)\s+(?:growth\s+)?(?:of\s+)?([\d]+\.?\d*)\s*%',
+    r'(?:quarter-on-quarter|QoQ|q-o-q)\s+(?:growth\s+)?(?:of\s+)?([\d]+\.?\d*)\s*%',
+    r'(?:up|down)\s+([\d]+\.?\d*)\s*%',
+])
+
+_EBITDA_PATTERNS = tuple(_icompile(p) for p in [
+    r'EBITDA\s+(?:of\s+)?(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)',
+    r'EBITDA\s+(?:of\s+)?(?:\$|USD)\s*([\d,]+\.?\d*)\s*(?:million|mn|billion|bn)',
+    r'EBITDA\s+(?:stands?\s+at|is|was)\s+(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)',
+    r'(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)\s+(?:in\s+)?EBITDA',
+])
+
+_MARGIN_PATTERNS = tuple(_icompile(p) for p in [
+    r'([\d]+\.?\d*)\s*%\s+(?:EBITDA\s+)?margin',
+    r'(?:EBITDA\s+)?margin\s+(?:of\s+)?([\d]+\.?\d*)\s*%',
+    r'([\d]+\.?\d*)\s*%\s+to\s+sales',
+    r'(?:gross|operating|net|profit)\s+margin\s+(?:of\s+)?([\d]+\.?\d*)\s*%',
+    r'margin\s+(?:stands?\s+at|is|was)\s+([\d]+\.?\d*)\s*%',
+])
+
+_FY_PATTERNS = tuple(_icompile(p) for p in [
+    r'\bFY\s*(\d{2,4})\b',
+    r'\bFY(\d{2,4})\b',
+    r'\b(?:fiscal\s+year\s+)?(\d{4})-(\d{2,4})\b'
+])
+
+_QUARTER_PATTERN = _icompile(r'\b(Q[1-4])\b')
+_COMBINED_PATTERN = _icompile(r'\b(Q[1-4])\s*FY\s*(\d{2,4})\b')
+
+# Unit keywords checked in order against the lower-cased match; first hit wins
+_MONEY_UNITS = (
+    (('crore', 'cr'), "crores"),
+    (('million', 'mn'), "million"),
+)
+
+def _extract_money(patterns, text: str) -> List[Dict[str, Any]]:
+    """Shared match loop for amount patterns (revenue, EBITDA)"""
+    results = []
+    seen = set()
+    for pattern in patterns:
+        matches = pattern.finditer(text)
+        for match in matches:
+            # Several patterns can match the exact same phrase; keep it once
+            span = match.span()
+            if span in seen:
+                continue
+            seen.add(span)
+            
+            raw_text = match.group(0)
+            value = match.group(1).replace(',', '')
+            rt_lo = raw_text.lower()
+            
+            # Determine currency and unit
+            currency = "INR" if "Rs" in raw_text or "INR" in raw_text else "USD"
+            unit = next((name for keys, name in _MONEY_UNITS if any(k in rt_lo for k in keys)), "billion")
+            
+            results.append({
+                "raw_text": raw_text,
+                "value": float(value) if '.' in value else int(value),
+                "currency": currency,
+                "unit": unit
+            })
+    
+    return results
+
 class FinancialExtractor:
     """Extract financial metrics using regex patterns"""
     
@@ -20,62 +111,33 @@ class FinancialExtractor:
     @staticmethod
     def extract_revenue(text: str) -> List[Dict[str, Any]]:
         """Extract revenue patterns"""
-        revenue_patterns = [
-            r'(?:revenue|income|sales|turnover)\s+(?:of\s+)?(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)',
-            r'(?:revenue|income|sales|turnover)\s+(?:of\s+)?(?:\$|USD)\s*([\d,]+\.?\d*)\s*(?:million|mn|billion|bn)',
-            r'(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)\s+(?:in\s+)?(?:revenue|income|sales|turnover)',
-            r'(?:\$|USD)\s*([\d,]+\.?\d*)\s*(?:million|mn|billion|bn)\s+(?:in\s+)?(?:revenue|income|sales|turnover)',
-            r'(?:total\s+)?(?:revenue|income|sales|turnover)[\s\w]*(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)',
-        ]
-        
-        results = []
-        for pattern in revenue_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                raw_text = match.group(0)
-                value = match.group(1).replace(',', '')
-                
-                # Determine currency and unit
-                currency = "INR" if "Rs" in raw_text or "INR" in raw_text else "USD"
-                unit = "crores" if "crore" in raw_text.lower() or "cr" in raw_text.lower() else (
-                    "million" if "million" in raw_text.lower() or "mn" in raw_text.lower() else "billion"
-                )
-                
-                results.append({
-                    "raw_text": raw_text,
-                    "value": float(value) if '.' in value else int(value),
-                    "currency": currency,
-                    "unit": unit
-                })
-        
-        return results
+        return _extract_money(_REVENUE_PATTERNS, text)
     
     @staticmethod
     def extract_growth_rates(text: str) -> List[Dict[str, Any]]:
         """Extract growth rate patterns"""
-        growth_patterns = [
-            r'([\d]+\.?\d*)\s*%\s+(?:growth|increase|rise)',
-            r'(?:grew|increased|rose)\s+(?:by\s+)?([\d]+\.?\d*)\s*%',
-            r'(?:growth|increase|rise)\s+(?:of\s+)?([\d]+\.?\d*)\s*%',
-            r'(?:year-on-year|YoY|y-o-y)\s+(?:growth\s+)?(?:of\s+)?([\d]+\.?\d*)\s*%',
-            r'(?:quarter-on-quarter|QoQ|q-o-q)\s+(?:growth\s+)?(?:of\s+)?([\d]+\.?\d*)\s*%',
-            r'(?:up|down)\s+([\d]+\.?\d*)\s*%',
-        ]
-        
         results = []
-        for pattern in growth_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        seen = set()
+        for pattern in _GROWTH_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
+                # Several patterns can match the exact same phrase; keep it once
+                span = match.span()
+                if span in seen:
+                    continue
+                seen.add(span)
+                
                 raw_text = match.group(0)
                 value = match.group(1)
+                rt_lo = raw_text.lower()
                 
                 # Determine type
-                growth_type = "YoY" if any(x in raw_text.lower() for x in ['year-on-year', 'yoy', 'y-o-y']) else (
-                    "QoQ" if any(x in raw_text.lower() for x in ['quarter-on-quarter', 'qoq', 'q-o-q']) else "general"
+                growth_type = "YoY" if any(x in rt_lo for x in ('year-on-year', 'yoy', 'y-o-y')) else (
+                    "QoQ" if any(x in rt_lo for x in ('quarter-on-quarter', 'qoq', 'q-o-q')) else "general"
                 )
                 
                 # Determine direction
-                direction = "negative" if "down" in raw_text.lower() else "positive"
+                direction = "negative" if "down" in rt_lo else "positive"
                 
                 results.append({
                     "raw_text": raw_text,
@@ -89,57 +151,31 @@ class FinancialExtractor:
     @staticmethod
     def extract_ebitda(text: str) -> List[Dict[str, Any]]:
         """Extract EBITDA patterns"""
-        ebitda_patterns = [
-            r'EBITDA\s+(?:of\s+)?(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)',
-            r'EBITDA\s+(?:of\s+)?(?:\$|USD)\s*([\d,]+\.?\d*)\s*(?:million|mn|billion|bn)',
-            r'EBITDA\s+(?:stands?\s+at|is|was)\s+(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)',
-            r'(?:Rs\.?|INR)\s*([\d,]+\.?\d*)\s*(?:crores?|cr)\s+(?:in\s+)?EBITDA',
-        ]
-        
-        results = []
-        for pattern in ebitda_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                raw_text = match.group(0)
-                value = match.group(1).replace(',', '')
-                
-                currency = "INR" if "Rs" in raw_text or "INR" in raw_text else "USD"
-                unit = "crores" if "crore" in raw_text.lower() or "cr" in raw_text.lower() else (
-                    "million" if "million" in raw_text.lower() or "mn" in raw_text.lower() else "billion"
-                )
-                
-                results.append({
-                    "raw_text": raw_text,
-                    "value": float(value) if '.' in value else int(value),
-                    "currency": currency,
-                    "unit": unit
-                })
-        
-        return results
+        return _extract_money(_EBITDA_PATTERNS, text)
     
     @staticmethod
     def extract_margins(text: str) -> List[Dict[str, Any]]:
         """Extract margin patterns"""
-        margin_patterns = [
-            r'([\d]+\.?\d*)\s*%\s+(?:EBITDA\s+)?margin',
-            r'(?:EBITDA\s+)?margin\s+(?:of\s+)?([\d]+\.?\d*)\s*%',
-            r'([\d]+\.?\d*)\s*%\s+to\s+sales',
-            r'(?:gross|operating|net|profit)\s+margin\s+(?:of\s+)?([\d]+\.?\d*)\s*%',
-            r'margin\s+(?:stands?\s+at|is|was)\s+([\d]+\.?\d*)\s*%',
-        ]
-        
         results = []
-        for pattern in margin_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        seen = set()
+        for pattern in _MARGIN_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
+                # Several patterns can match the exact same phrase; keep it once
+                span = match.span()
+                if span in seen:
+                    continue
+                seen.add(span)
+                
                 raw_text = match.group(0)
                 value = match.group(1)
+                rt_lo = raw_text.lower()
                 
                 # Determine margin type
-                margin_type = "EBITDA" if "ebitda" in raw_text.lower() else (
-                    "gross" if "gross" in raw_text.lower() else (
-                        "operating" if "operating" in raw_text.lower() else (
-                            "net" if "net" in raw_text.lower() else "general"
+                margin_type = "EBITDA" if "ebitda" in rt_lo else (
+                    "gross" if "gross" in rt_lo else (
+                        "operating" if "operating" in rt_lo else (
+                            "net" if "net" in rt_lo else "general"
                         )
                     )
                 )
@@ -162,20 +198,13 @@ class FinancialExtractor:
         }
         
         # Extract quarters
-        quarter_pattern = r'\b(Q[1-4])\b'
-        quarters = re.findall(quarter_pattern, text, re.IGNORECASE)
+        quarters = _QUARTER_PATTERN.findall(text)
         quarter_info["quarters"] = list(set(quarters))
         
         # Extract fiscal years
-        fy_patterns = [
-            r'\bFY\s*(\d{2,4})\b',
-            r'\bFY(\d{2,4})\b',
-            r'\b(?:fiscal\s+year\s+)?(\d{4})-(\d{2,4})\b'
-        ]
-        
         fiscal_years = set()
-        for pattern in fy_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in _FY_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
                 if len(match.groups()) == 2:  # For patterns like 2018-19
                     fiscal_years.add(f"FY{match.group(2)}")
@@ -189,8 +218,7 @@ class FinancialExtractor:
         quarter_info["fiscal_years"] = sorted(list(fiscal_years))
         
         # Extract combined quarter+FY references
-        combined_pattern = r'\b(Q[1-4])\s*FY\s*(\d{2,4})\b'
-        combined_matches = re.finditer(combined_pattern, text, re.IGNORECASE)
+        combined_matches = _COMBINED_PATTERN.finditer(text)
         for match in combined_matches:
             quarter = match.group(1).upper()
             year = match.group(2)
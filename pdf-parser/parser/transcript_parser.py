@@ -2,16 +2,25 @@
 
 import re
 
+# Moderator lines and "Speaker Name:" lines share one pattern; group 1 (or 2)
+# is the speaker and group 3 the text after the colon. Used with .match(), which
+# already anchors at the start, so no leading ^
+_SPEAKER = re.compile(r'(?:(Moderator)|([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*))\s*:\s*(.*)\Z')
+
+# Lower-cased names that look like "Name:" lines but are not speakers
+_INVALID_SPEAKERS = frozenset({'page', 'question', 'answer', 'operator', 'company'})
+
+# Control characters below 32 except tab and newline, for str.translate
+_CTRL_DROP = dict.fromkeys(i for i in range(32) if i not in (9, 10))
+
 def clean_dialogue_text(text):
     """Clean text for proper JSON formatting"""
     # Remove extra whitespace
     text = ' '.join(text.split())
     
-    # Remove any control characters
-    text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\t')
-    
-    # Replace multiple newlines with single space
-    text = re.sub(r'\n+', ' ', text)
+    # Remove any control characters (the split/join above already turned
+    # newlines into single spaces)
+    text = text.translate(_CTRL_DROP)
     
     # Trim whitespace
     text = text.strip()
@@ -25,56 +34,50 @@ def parse_transcript(text):
     current_speaker = None
     current_text = []
     
-    lines = text.split('\n')
+    # Bind hot-loop callables to locals once instead of per line
+    add_dialogue = dialogue.append
+    add_speaker = speakers.add
+    add_text = current_text.append
+    clean = clean_dialogue_text
+    match_speaker = _SPEAKER.match
+    
+    def flush(speaker, parts):
+        """Append the finished turn, if it produced any text"""
+        if speaker and parts:
+            combined_text = clean(' '.join(parts))
+            if combined_text:
+                add_dialogue({
+                    "speaker": speaker,
+                    "text": combined_text
+                })
+    
+    # splitlines also breaks on \r, form feeds and Unicode line separators
+    lines = text.splitlines()
+    strip = str.strip
     
     for line in lines:
-        line = line.strip()
+        line = strip(line)
         if not line:
             continue
         
-        # Check for Moderator
-        if line.startswith('Moderator:'):
-            if current_speaker and current_text:
-                combined_text = clean_dialogue_text(' '.join(current_text))
-                if combined_text:
-                    dialogue.append({
-                        "speaker": current_speaker,
-                        "text": combined_text
-                    })
-            current_speaker = "Moderator"
-            speakers.add("Moderator")
-            current_text = [line[10:].strip()]
-            continue
-        
-        # Check for Speaker Name:
-        match = re.match(r'^([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)\s*:\s*(.*)$', line)
+        # Check for Moderator: or Speaker Name:
+        match = match_speaker(line)
         if match:
-            name = match.group(1).strip()
+            name = match.group(1) or match.group(2).strip()
             # Validate speaker name
-            if len(name) > 2 and name.lower() not in ['page', 'question', 'answer', 'operator', 'company']:
-                if current_speaker and current_text:
-                    combined_text = clean_dialogue_text(' '.join(current_text))
-                    if combined_text:
-                        dialogue.append({
-                            "speaker": current_speaker,
-                            "text": combined_text
-                        })
+            if len(name) > 2 and name.lower() not in _INVALID_SPEAKERS:
+                flush(current_speaker, current_text)
                 current_speaker = name
-                speakers.add(name)
-                current_text = [match.group(2).strip()]
+                add_speaker(name)
+                current_text = [match.group(3).strip()]
+                add_text = current_text.append
                 continue
         
         # Add to current speaker's text
         if current_speaker:
-            current_text.append(line)
+            add_text(line)
     
     # Add last speaker
-    if current_speaker and current_text:
-        combined_text = clean_dialogue_text(' '.join(current_text))
-        if combined_text:
-            dialogue.append({
-                "speaker": current_speaker,
-                "text": combined_text
-            })
+    flush(current_speaker, current_text)
     
     return sorted(list(speakers)), dialogue
\ No newline at end of file
@@ -1,10 +1,45 @@
-import json
 import re
 import os
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
-import glob
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from functools import lru_cache
+
+from json_io import load_json, save_json, save_json_streamed
+
+# Filename patterns, compiled once
+_MONTH_YEAR_RE = re.compile(r'([A-Za-z]{3,9})_(\d{4})')
+_QUARTER_FY_RE = re.compile(r'Q(\d)_FY(\d{2,4})', re.IGNORECASE)
+# First month of fiscal quarters Q1..Q4 (April-March FY)
+_QUARTER_START_MONTHS = (4, 7, 10, 1)
+_YEAR_RE = re.compile(r'(\d{4})')
+# Applied to the lower-cased filename
+_QUARTER_RE = re.compile(r'q(\d)')
+_FY_RE = re.compile(r'fy(\d{2,4})')
+
+# Speaker titles in priority order. Each branch is a lookahead for "any of this
+# role's titles anywhere in the name" followed by an empty named group, so one
+# match() tries the roles in order, like the original chain of any() scans
+_ROLE_TITLES = [
+    ("CEO", ['ceo', 'chief executive']),
+    ("CFO", ['cfo', 'chief financial']),
+    ("COO", ['coo', 'chief operating']),
+    ("MD", ['md', 'managing director']),
+    ("Moderator", ['moderator']),
+    ("Management", ['management'])
+]
+_ROLE_PATTERN = re.compile('|'.join(
+    r"(?=.*?(?:" + '|'.join(re.escape(title) for title in titles) + f"))(?P<{role}>)"
+    for role, titles in _ROLE_TITLES
+), re.DOTALL)
+
+@lru_cache(maxsize=2048)
+def speaker_role(speaker_name):
+    """Role for a speaker name; cached, since a transcript repeats a few dozen speakers"""
+    match = _ROLE_PATTERN.match(speaker_name.lower())
+    return match.lastgroup if match else "Analyst/Other"
 
 class RAGFriendlyEarningsCallCategorizer:
     def __init__(self):
@@ -72,18 +107,33 @@ class RAGFriendlyEarningsCallCategorizer:
             ]
         }
         
-        # Compile regex patterns for better performance
-        self.category_patterns = {}
+        # One alternation over every keyword (longest first) so categorize_dialogue
+        # scans each text once. A keyword can belong to several categories, and a
+        # shorter keyword can match at the same spot ("fda" inside "fda approval"),
+        # so each keyword maps to every category that would have matched there
+        categories_by_keyword = defaultdict(set)
         for category, keywords in self.categories.items():
-            pattern = r'\b(?:' + '|'.join(re.escape(keyword) for keyword in keywords) + r')\b'
-            self.category_patterns[category] = re.compile(pattern, re.IGNORECASE)
+            for keyword in keywords:
+                categories_by_keyword[keyword].add(category)
+        
+        all_keywords = sorted(categories_by_keyword, key=len, reverse=True)
+        self.keyword_pattern = re.compile(
+            r'\b(?:' + '|'.join(re.escape(keyword) for keyword in all_keywords) + r')\b'
+        )
+        self.keyword_categories = {}
+        for keyword in all_keywords:
+            matched = set(categories_by_keyword[keyword])
+            for prefix in all_keywords:
+                if len(prefix) < len(keyword) and re.match(r'\b' + re.escape(prefix) + r'\b', keyword):
+                    matched |= categories_by_keyword[prefix]
+            self.keyword_categories[keyword] = frozenset(matched)
     
     def extract_date_from_filename(self, filename):
         """Extract date from filename patterns"""
         name = Path(filename).stem
         
         # Pattern 1: Month_Year (e.g., Aug_2018)
-        month_year_match = re.search(r'([A-Za-z]{3,9})_(\d{4})', name)
+        month_year_match = _MONTH_YEAR_RE.search(name)
         if month_year_match:
             month_str, year = month_year_match.groups()
             try:
@@ -93,7 +143,7 @@ class RAGFriendlyEarningsCallCategorizer:
                 pass
         
         # Pattern 2: Q1_FY19 format
-        quarter_fy_match = re.search(r'Q(\d)_FY(\d{2,4})', name, re.IGNORECASE)
+        quarter_fy_match = _QUARTER_FY_RE.search(name)
         if quarter_fy_match:
             quarter, fy_year = quarter_fy_match.groups()
             if len(fy_year) == 2:
@@ -101,13 +151,15 @@ class RAGFriendlyEarningsCallCategorizer:
             else:
                 fy_year = int(fy_year)
             
-            quarter_months = {1: 4, 2: 7, 3: 10, 4: 1}
-            month = quarter_months[int(quarter)]
+            # Q0/Q5..Q9 are bad filenames: raise so the file is reported and skipped
+            if not 1 <= int(quarter) <= 4:
+                raise ValueError(f"Invalid quarter Q{quarter} in {filename}")
+            month = _QUARTER_START_MONTHS[int(quarter) - 1]
             year = fy_year if month != 1 else fy_year + 1
             return datetime(year, month, 1)
         
         # Pattern 3: Just year
-        year_match = re.search(r'(\d{4})', name)
+        year_match = _YEAR_RE.search(name)
         if year_match:
             return datetime(int(year_match.group(1)), 1, 1)
         
@@ -115,62 +167,55 @@ class RAGFriendlyEarningsCallCategorizer:
     
     def categorize_dialogue(self, dialogue_entry):
         """Categorize a single dialogue entry"""
+        # Lower-case once; the case-sensitive scan then matches keywords exactly
         text = dialogue_entry.get('text', '').lower()
-        categories_found = []
+        found = set()
+        
+        # Step from each hit's start + 1 so overlapping keywords are still seen
+        pos = 0
+        while len(found) < len(self.categories):
+            match = self.keyword_pattern.search(text, pos)
+            if match is None:
+                break
+            found |= self.keyword_categories[match.group()]
+            pos = match.start() + 1
         
-        for category, pattern in self.category_patterns.items():
-            if pattern.search(text):
-                categories_found.append(category)
+        # Keep the categories in their declared order
+        categories_found = [category for category in self.categories if category in found]
         
         return categories_found if categories_found else ["General"]
     
     def create_rag_document(self, dialogue_entry, metadata):
-        """Create a RAG-friendly document chunk"""
+        """Create a RAG-friendly document chunk from the per-file metadata template"""
+        speaker = dialogue_entry['speaker']
+        text = dialogue_entry['text']
+        
+        doc_metadata = metadata.copy()
+        doc_metadata["speaker"] = speaker
+        doc_metadata["speaker_role"] = self.get_speaker_role(speaker)
+        doc_metadata["content_length"] = len(text)
+        doc_metadata["word_count"] = len(text.split())
+        
         return {
-            "id": f"{metadata['company']}_{metadata['date']}_{dialogue_entry['speaker'][:10]}_{hash(dialogue_entry['text'][:50]) % 10000}",
-            "content": dialogue_entry['text'],
-            "metadata": {
-                "company": metadata['company'],
-                "speaker": dialogue_entry['speaker'],
-                "date": metadata['date'],
-                "source_file": metadata['source_file'],
-                "quarter": metadata.get('quarter', ''),
-                "fiscal_year": metadata.get('fiscal_year', ''),
-                "speaker_role": self.get_speaker_role(dialogue_entry['speaker']),
-                "content_length": len(dialogue_entry['text']),
-                "word_count": len(dialogue_entry['text'].split())
-            }
+            "id": f"{metadata['company']}_{metadata['date']}_{speaker[:10]}_{blake2b(text.encode('utf-8'), digest_size=8).hexdigest()}",
+            "content": text,
+            "metadata": doc_metadata
         }
     
     def get_speaker_role(self, speaker_name):
         """Determine speaker role based on name patterns"""
-        speaker_lower = speaker_name.lower()
-        
-        if any(title in speaker_lower for title in ['ceo', 'chief executive']):
-            return "CEO"
-        elif any(title in speaker_lower for title in ['cfo', 'chief financial']):
-            return "CFO"
-        elif any(title in speaker_lower for title in ['coo', 'chief operating']):
-            return "COO"
-        elif any(title in speaker_lower for title in ['md', 'managing director']):
-            return "MD"
-        elif 'moderator' in speaker_lower:
-            return "Moderator"
-        elif 'management' in speaker_lower:
-            return "Management"
-        else:
-            return "Analyst/Other"
+        return speaker_role(speaker_name)
     
     def extract_quarter_and_fy(self, filename, date):
         """Extract quarter and FY information"""
         name = filename.lower()
         
         # Extract quarter
-        quarter_match = re.search(r'q(\d)', name)
+        quarter_match = _QUARTER_RE.search(name)
         quarter = f"Q{quarter_match.group(1)}" if quarter_match else ""
         
         # Extract FY
-        fy_match = re.search(r'fy(\d{2,4})', name)
+        fy_match = _FY_RE.search(name)
         if fy_match:
             fy_year = fy_match.group(1)
             fiscal_year = f"FY{fy_year}" if len(fy_year) == 2 else f"FY{fy_year[-2:]}"
@@ -185,7 +230,12 @@ class RAGFriendlyEarningsCallCategorizer:
     
     def process_company_data(self, company_folder):
         """Process all JSON files for a company and organize by category"""
-        json_files = glob.glob(os.path.join(company_folder, "*.json"))
+        # Same selection as glob("*.json"), which skips dot-files, without glob's regex
+        with os.scandir(company_folder) as it:
+            json_files = [
+                entry.path for entry in it
+                if entry.name.endswith('.json') and not entry.name.startswith('.') and entry.is_file()
+            ]
         
         if not json_files:
             print(f"No JSON files found in {company_folder}")
@@ -217,63 +267,80 @@ class RAGFriendlyEarningsCallCategorizer:
             "source_files": set()
         }
         
-        all_dates = []
+        # Company-wide [earliest, latest] file dates, folded as datetimes like the categories
+        company_range = [None, None]
+        
+        # Per-category accumulators bound once, so folding a document does no nested
+        # dict lookups: (documents.append, speakers.add, source_files.add, [earliest, latest]).
+        # Dates are compared as datetimes and formatted once when finalizing
+        accumulators = {
+            category: (data["documents"].append, data["speakers"].add, data["source_files"].add, [None, None])
+            for category, data in categories_data.items()
+        }
         
-        # Process each file
+        # Date each file; a filename whose date cannot be built (e.g. year 0) skips
+        # just that file, as the per-file try did before
+        dated_files = []
         for json_file in sorted(json_files):
-            print(f"Processing: {os.path.basename(json_file)}")
-            
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                filename = os.path.basename(json_file)
-                extracted_date = self.extract_date_from_filename(filename)
-                quarter, fiscal_year = self.extract_quarter_and_fy(filename, extracted_date)
-                all_dates.append(extracted_date)
+                dated_files.append((self.extract_date_from_filename(os.path.basename(json_file)), json_file))
+            except Exception as e:
+                print(f"Processing: {os.path.basename(json_file)}")
+                print(f"Error processing {json_file}: {e}")
+        
+        # Order files by transcript date, name order breaking ties (the sort is stable).
+        # Each file's documents share its date, so appending them in this order keeps
+        # every category's documents sorted by date without a sort afterwards
+        dated_files.sort(key=lambda item: item[0])
+        file_dates = [extracted_date for extracted_date, _ in dated_files]
+        ordered_files = [json_file for _, json_file in dated_files]
+        
+        # Categorize files in worker processes; map keeps the file order
+        with ProcessPoolExecutor(initializer=_init_worker, initargs=(self,)) as executor:
+            results = executor.map(_process_file, ordered_files, [company_name] * len(ordered_files), file_dates, chunksize=4)
+            
+            # Fold each file's documents into the categories
+            for json_file, (filename, extracted_date, entries, error) in zip(ordered_files, results):
+                print(f"Processing: {filename}")
                 
-                file_metadata = {
-                    "company": company_name,
-                    "source_file": filename,
-                    "date": extracted_date.isoformat(),
-                    "quarter": quarter,
-                    "fiscal_year": fiscal_year
-                }
+                if extracted_date is not None:
+                    if company_range[0] is None:
+                        company_range[0] = company_range[1] = extracted_date
+                    elif extracted_date < company_range[0]:
+                        company_range[0] = extracted_date
+                    elif extracted_date > company_range[1]:
+                        company_range[1] = extracted_date
                 
-                # Process each dialogue entry
-                for dialogue_entry in data.get('dialogue', []):
-                    categories = self.categorize_dialogue(dialogue_entry)
-                    rag_document = self.create_rag_document(dialogue_entry, file_metadata)
-                    
-                    # Add to each relevant category
+                for categories, rag_document, speaker in entries:
+                    # Add to each relevant category. categorize_dialogue only returns
+                    # self.categories keys or "General", all seeded above, so no guard
                     for category in categories:
-                        if category in categories_data:
-                            categories_data[category]["documents"].append(rag_document)
-                            categories_data[category]["speakers"].add(dialogue_entry['speaker'])
-                            categories_data[category]["source_files"].add(filename)
-                            
-                            # Update date range
-                            if categories_data[category]["date_range"]["earliest"] is None:
-                                categories_data[category]["date_range"]["earliest"] = extracted_date.isoformat()
-                                categories_data[category]["date_range"]["latest"] = extracted_date.isoformat()
-                            else:
-                                if extracted_date.isoformat() < categories_data[category]["date_range"]["earliest"]:
-                                    categories_data[category]["date_range"]["earliest"] = extracted_date.isoformat()
-                                if extracted_date.isoformat() > categories_data[category]["date_range"]["latest"]:
-                                    categories_data[category]["date_range"]["latest"] = extracted_date.isoformat()
-            
-            except Exception as e:
-                print(f"Error processing {json_file}: {str(e)}")
-                continue
+                        add_document, add_speaker, add_source_file, date_range = accumulators[category]
+                        add_document(rag_document)
+                        add_speaker(speaker)
+                        add_source_file(filename)
+                        
+                        # Update date range
+                        if date_range[0] is None:
+                            date_range[0] = date_range[1] = extracted_date
+                        elif extracted_date < date_range[0]:
+                            date_range[0] = extracted_date
+                        elif extracted_date > date_range[1]:
+                            date_range[1] = extracted_date
+                
+                if error is not None:
+                    print(f"Error processing {json_file}: {error}")
         
         # Finalize the data
         for category in categories_data:
-            # Sort documents by date
-            categories_data[category]["documents"].sort(key=lambda x: x["metadata"]["date"])
             categories_data[category]["total_documents"] = len(categories_data[category]["documents"])
             categories_data[category]["speakers"] = list(categories_data[category]["speakers"])
             categories_data[category]["source_files"] = list(categories_data[category]["source_files"])
             
+            earliest, latest = accumulators[category][3]
+            if earliest is not None:
+                categories_data[category]["date_range"] = {"earliest": earliest.isoformat(), "latest": latest.isoformat()}
+            
             # Remove empty categories
             if categories_data[category]["total_documents"] == 0:
                 categories_data[category] = None
@@ -287,8 +354,8 @@ class RAGFriendlyEarningsCallCategorizer:
             "processing_date": datetime.now().isoformat(),
             "total_files_processed": len(json_files),
             "date_range": {
-                "earliest": min(all_dates).isoformat() if all_dates else None,
-                "latest": max(all_dates).isoformat() if all_dates else None
+                "earliest": company_range[0].isoformat() if company_range[0] is not None else None,
+                "latest": company_range[1].isoformat() if company_range[1] is not None else None
             },
             "total_categories": len(categories_data),
             "categories": categories_data,
@@ -304,56 +371,65 @@ class RAGFriendlyEarningsCallCategorizer:
         """Create separate files for each category"""
         company_name = company_data["company"].lower()
         category_files_created = []
+        created_date = datetime.now().isoformat()
         
-        for category_name, category_data in company_data["categories"].items():
-            if category_data["total_documents"] > 0:
-                # Create category-specific file
-                category_filename = f"{company_name}_{category_name.lower().replace(' & ', '_').replace(' ', '_')}.json"
-                category_file_path = os.path.join(results_dir, "by_category", category_filename)
-                
-                # Ensure directory exists
-                os.makedirs(os.path.dirname(category_file_path), exist_ok=True)
-                
-                # Prepare category file content
-                category_file_content = {
-                    "company": company_data["company"],
-                    "category": category_name,
-                    "category_keywords": category_data["category_keywords"],
-                    "total_documents": category_data["total_documents"],
-                    "date_range": category_data["date_range"],
-                    "speakers_involved": category_data["speakers"],
-                    "source_files": category_data["source_files"],
-                    "documents": category_data["documents"],
-                    "created_date": datetime.now().isoformat()
-                }
-                
-                with open(category_file_path, 'w', encoding='utf-8') as f:
-                    json.dump(category_file_content, f, indent=2, ensure_ascii=False)
-                
-                category_files_created.append(category_file_path)
-                print(f"✓ Created category file: {category_filename}")
+        # Every category file goes in the same directory, so create it once
+        category_dir = os.path.join(results_dir, "by_category")
+        os.makedirs(category_dir, exist_ok=True)
+        
+        # Buffer the status lines and print them once, even if a save fails part-way
+        msgs = []
+        try:
+            for category_name, category_data in company_data["categories"].items():
+                if category_data["total_documents"] > 0:
+                    # Create category-specific file
+                    category_filename = f"{company_name}_{category_name.lower().replace(' & ', '_').replace(' ', '_')}.json"
+                    category_file_path = os.path.join(category_dir, category_filename)
+                    
+                    # Prepare category file content
+                    category_file_content = {
+                        "company": company_data["company"],
+                        "category": category_name,
+                        "category_keywords": category_data["category_keywords"],
+                        "total_documents": category_data["total_documents"],
+                        "date_range": category_data["date_range"],
+                        "speakers_involved": category_data["speakers"],
+                        "source_files": category_data["source_files"],
+                        "documents": category_data["documents"],
+                        "created_date": created_date
+                    }
+                    
+                    # Stream the documents list, which is shared with company_data
+                    save_json_streamed(category_file_content, category_file_path)
+                    
+                    category_files_created.append(category_file_path)
+                    msgs.append(f"✓ Created category file: {category_filename}")
+        finally:
+            if msgs:
+                print('\n'.join(msgs))
         
         return category_files_created
     
     def create_embeddings_ready_format(self, company_data, results_dir):
         """Create a format ready for embeddings/vector database"""
         company_name = company_data["company"].lower()
+        categories = company_data["categories"]
         
-        # Flatten all documents with their categories
-        embeddings_data = []
-        
-        for category_name, category_data in company_data["categories"].items():
-            for doc in category_data["documents"]:
-                embedding_doc = {
-                    "id": doc["id"],
-                    "text": doc["content"],
-                    "metadata": {
-                        **doc["metadata"],
-                        "category": category_name,
-                        "category_keywords": category_data["category_keywords"]
+        def embedding_docs():
+            # Flatten all documents with their categories, one at a time as the file is written
+            for category_name, category_data in categories.items():
+                category_keywords = category_data["category_keywords"]
+                for doc in category_data["documents"]:
+                    # dict.copy() plus two stores is cheaper than re-splatting the metadata
+                    metadata = doc["metadata"].copy()
+                    metadata["category"] = category_name
+                    metadata["category_keywords"] = category_keywords
+                    
+                    yield {
+                        "id": doc["id"],
+                        "text": doc["content"],
+                        "metadata": metadata
                     }
-                }
-                embeddings_data.append(embedding_doc)
         
         # Save embeddings-ready file
         embeddings_file = os.path.join(results_dir, "embeddings", f"{company_name}_embeddings_ready.json")
@@ -361,17 +437,61 @@ class RAGFriendlyEarningsCallCategorizer:
         
         embeddings_content = {
             "company": company_data["company"],
-            "total_documents": len(embeddings_data),
+            "total_documents": sum(len(category_data["documents"]) for category_data in categories.values()),
             "created_date": datetime.now().isoformat(),
-            "documents": embeddings_data
+            "documents": embedding_docs()
         }
         
-        with open(embeddings_file, 'w', encoding='utf-8') as f:
-            json.dump(embeddings_content, f, indent=2, ensure_ascii=False)
+        # Streamed, so the flattened list is never held in memory as a whole
+        save_json_streamed(embeddings_content, embeddings_file)
         
         print(f"✓ Created embeddings file: {company_name}_embeddings_ready.json")
         return embeddings_file
 
+# Per-process categorizer for the worker pool, set once by the pool initializer
+_worker_categorizer = None
+
+def _init_worker(categorizer):
+    """Install the parent's categorizer in this worker"""
+    global _worker_categorizer
+    _worker_categorizer = categorizer
+
+def _process_file(json_file, company_name, extracted_date):
+    """Categorize one transcript JSON file dated extracted_date (runs in a worker process)"""
+    # Documents built before an error are still returned, like the serial loop kept them
+    categorizer = _worker_categorizer
+    filename = os.path.basename(json_file)
+    file_date = None
+    entries = []
+    
+    try:
+        data = load_json(json_file)
+        
+        quarter, fiscal_year = categorizer.extract_quarter_and_fy(filename, extracted_date)
+        file_date = extracted_date
+        
+        # Document metadata template, copied per dialogue entry. "speaker" is a
+        # placeholder so it keeps its place in the output key order
+        file_metadata = {
+            "company": company_name,
+            "speaker": None,
+            "date": extracted_date.isoformat(),
+            "source_file": filename,
+            "quarter": quarter,
+            "fiscal_year": fiscal_year
+        }
+        
+        # Process each dialogue entry
+        for dialogue_entry in data.get('dialogue', []):
+            categories = categorizer.categorize_dialogue(dialogue_entry)
+            rag_document = categorizer.create_rag_document(dialogue_entry, file_metadata)
+            entries.append((categories, rag_document, dialogue_entry['speaker']))
+    
+    except Exception as e:
+        return filename, file_date, entries, str(e)
+    
+    return filename, file_date, entries, None
+
 def main():
     """Main function to process all companies"""
     categorizer = RAGFriendlyEarningsCallCategorizer()
@@ -385,11 +505,8 @@ def main():
     os.makedirs(os.path.join(results_dir, "complete"), exist_ok=True)
     
     # Get all company folders
-    company_folders = [
-        os.path.join(output_base_dir, d) 
-        for d in os.listdir(output_base_dir) 
-        if os.path.isdir(os.path.join(output_base_dir, d))
-    ]
+    with os.scandir(output_base_dir) as it:
+        company_folders = [entry.path for entry in it if entry.is_dir()]
     
     if not company_folders:
         print("No company folders found in output directory!")
@@ -410,8 +527,7 @@ def main():
         if company_data:
             # 1. Save complete company data
             complete_file = os.path.join(results_dir, "complete", f"{company_name.lower()}_complete.json")
-            with open(complete_file, 'w', encoding='utf-8') as f:
-                json.dump(company_data, f, indent=2, ensure_ascii=False)
+            save_json(company_data, complete_file)
             print(f"✓ Saved complete data: {complete_file}")
             
             # 2. Create category-specific files
@@ -457,8 +573,7 @@ def main():
     }
     
     summary_file = os.path.join(results_dir, "master_summary.json")
-    with open(summary_file, 'w', encoding='utf-8') as f:
-        json.dump(master_summary, f, indent=2, ensure_ascii=False)
+    save_json(master_summary, summary_file)
     
     print("\n" + "=" * 80)
     print("🎉 RAG-Ready Processing Complete!")
@@ -1,13 +1,75 @@
-import json
 import numpy as np
 from openai import OpenAI
 import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Tuple
+from datetime import datetime, timedelta
+
+from json_io import load_json
+
+# Document dates are kept as naive microseconds since this epoch, so days_ago for a
+# whole company is one integer subtraction and floor division (like timedelta.days)
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+# Question embeddings kept per SimpleRAGSearch, least recently used evicted first
+_QUESTION_CACHE_SIZE = 1024
+
+def _load_embeddings_file(file_path):
+    """Load one company's embeddings file into search arrays (runs in a worker process)"""
+    data = load_json(file_path)
+    
+    # Stack the embedded documents into one contiguous float32 matrix with
+    # L2-normalized rows, so cosine similarity is a plain dot product.
+    # Zero vectors stay zero and score 0
+    documents = [doc for doc in data['documents'] if doc.get('embedding') is not None]
+    if documents:
+        matrix = np.asarray([doc['embedding'] for doc in documents], dtype=np.float32)
+    else:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    
+    # The matrix now holds the vectors; dropping the float lists keeps them out of
+    # memory and out of the pickle sent back to the parent process
+    for doc in documents:
+        del doc['embedding']
+    
+    # Parse dates and quality weights once for the weighted score. Documents whose
+    # date or quality score cannot be used are scored by similarity alone
+    doc_times = np.zeros(len(documents), dtype=np.int64)
+    quality_weights = np.zeros(len(documents), dtype=np.float64)
+    scorable = np.zeros(len(documents), dtype=bool)
+    for i, doc in enumerate(documents):
+        metadata = doc['metadata']
+        try:
+            doc_date = datetime.fromisoformat(metadata.get('date', '').replace('Z', '+00:00'))
+            if doc_date.tzinfo is not None:
+                # Subtracting it from the naive datetime.now() raises TypeError
+                continue
+            doc_times[i] = (doc_date - _EPOCH) // _MICROSECOND
+            quality_weights[i] = (metadata.get('quality_score', 5.0) or 5.0) / 10.0
+            scorable[i] = True
+        except Exception:
+            pass
+    
+    return {
+        'documents': documents,
+        'matrix': matrix,
+        'doc_times': doc_times,
+        'quality_weights': quality_weights,
+        'scorable': scorable,
+        'total_docs': len(data['documents'])
+    }
 
 class SimpleRAGSearch:
     def __init__(self, openai_api_key):
         self.client = OpenAI(api_key=openai_api_key)
         self.companies_data = {}
+        self.question_embeddings = OrderedDict()
+        self._build_search_index()
         self.load_embeddings()
     
     def load_embeddings(self):
@@ -18,88 +80,105 @@ class SimpleRAGSearch:
             print(f"❌ Embeddings directory not found: {embeddings_dir}")
             return
         
-        # Load all embedding files
+        # Find all embedding files
+        embedding_files = []
         for filename in os.listdir(embeddings_dir):
             if filename.endswith('_embeddings.json'):
                 company_name = filename.replace('_embeddings.json', '').upper()
-                file_path = os.path.join(embeddings_dir, filename)
-                
+                embedding_files.append((company_name, os.path.join(embeddings_dir, filename)))
                 print(f"📂 Loading {company_name} embeddings...")
-                
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                self.companies_data[company_name] = {
-                    'documents': data['documents'],
-                    'total_docs': len(data['documents'])
-                }
-                
-                print(f"✅ Loaded {len(data['documents'])} documents for {company_name}")
+        
+        # Parse the companies in parallel worker processes, unless there is only one
+        # file or one CPU to run them on
+        file_paths = [file_path for _, file_path in embedding_files]
+        workers = min(len(file_paths), os.cpu_count() or 1)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                loaded = list(executor.map(_load_embeddings_file, file_paths))
+        else:
+            loaded = [_load_embeddings_file(file_path) for file_path in file_paths]
+        
+        for (company_name, _), company_data in zip(embedding_files, loaded):
+            self.companies_data[company_name] = company_data
+            print(f"✅ Loaded {company_data['total_docs']} documents for {company_name}")
+        
+        self._build_search_index()
         
         total_docs = sum(company['total_docs'] for company in self.companies_data.values())
         print(f"\n🎯 Ready! Loaded {len(self.companies_data)} companies, {total_docs} total documents")
     
-    def create_question_embedding(self, question: str):
-        """Convert question to embedding"""
-        try:
-            response = self.client.embeddings.create(
-                input=question,
-                model="text-embedding-3-small"
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            print(f"❌ Error creating question embedding: {str(e)}")
-            return None
-    
-    def cosine_similarity(self, vec1, vec2):
-        """Calculate cosine similarity between two vectors"""
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
+    def _build_search_index(self):
+        """Stack every company's search arrays into one, with each company a contiguous row range"""
+        companies = [(name, data) for name, data in self.companies_data.items() if data['documents']]
         
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
+        self.company_names = [name for name, _ in companies]
+        self.company_ranges = {}
+        self.documents = []
+        counts = []
+        for name, data in companies:
+            self.company_ranges[name] = (len(self.documents), len(self.documents) + len(data['documents']))
+            self.documents.extend(data['documents'])
+            counts.append(len(data['documents']))
+        self.doc_company_ids = np.repeat(np.arange(len(companies), dtype=np.int32), counts)
         
-        if norm1 == 0 or norm2 == 0:
-            return 0
+        if not companies:
+            self.search_matrix = np.zeros((0, 0), dtype=np.float32)
+            self.doc_times = np.zeros(0, dtype=np.int64)
+            self.quality_weights = np.zeros(0, dtype=np.float64)
+            self.scorable = np.zeros(0, dtype=bool)
+            return
         
-        return dot_product / (norm1 * norm2)
-    
-    def calculate_weighted_score(self, similarity: float, date_str: str, content_quality: float = None):
-        """Calculate final score combining similarity, recency, and quality"""
-        from datetime import datetime
+        self.search_matrix = np.vstack([data['matrix'] for _, data in companies])
+        self.doc_times = np.concatenate([data['doc_times'] for _, data in companies])
+        self.quality_weights = np.concatenate([data['quality_weights'] for _, data in companies])
+        self.scorable = np.concatenate([data['scorable'] for _, data in companies])
         
-        try:
-            # Parse date
-            doc_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            current_date = datetime.now()
-            
-            # Calculate days ago
-            days_ago = (current_date - doc_date).days
-            
-            # Recency weight (more recent = higher weight)
-            # Recent content gets up to 1.0, older content gets lower weights
-            if days_ago <= 90:  # Last 3 months
-                recency_weight = 1.0
-            elif days_ago <= 365:  # Last year
-                recency_weight = 0.8
-            elif days_ago <= 730:  # Last 2 years
-                recency_weight = 0.6
-            else:  # Older than 2 years
-                recency_weight = 0.4
-            
-            # Quality weight (from embeddings generation)
-            quality_weight = (content_quality or 5.0) / 10.0  # Normalize to 0-1
-            
-            # Combined weighted score
-            # 70% similarity + 20% recency + 10% quality
-            weighted_score = (similarity * 0.7) + (recency_weight * 0.2) + (quality_weight * 0.1)
-            
-            return weighted_score, recency_weight, days_ago
+        # Per-company arrays become views into the stacked ones, so nothing is held twice
+        for name, data in companies:
+            start, stop = self.company_ranges[name]
+            data['matrix'] = self.search_matrix[start:stop]
+            data['doc_times'] = self.doc_times[start:stop]
+            data['quality_weights'] = self.quality_weights[start:stop]
+            data['scorable'] = self.scorable[start:stop]
+    
+    def create_question_embeddings(self, questions: List[str]):
+        """Convert questions to an (n, D) float32 embedding array with one API call for the uncached ones"""
+        # Embed each distinct uncached question once, in a single request
+        missing = [question for question in dict.fromkeys(questions) if question not in self.question_embeddings]
+        if missing:
+            try:
+                response = self.client.embeddings.create(
+                    input=missing,
+                    model="text-embedding-3-small"
+                )
+                new_embeddings = np.array([item.embedding for item in response.data], dtype=np.float32)
+            except Exception as e:
+                # Failures are not cached, so the next attempt retries
+                print(f"❌ Error creating question embedding: {str(e)}")
+                return None
             
-        except Exception as e:
-            # Fallback to just similarity if date parsing fails
-            return similarity, 1.0, 0
+            for question, embedding in zip(missing, new_embeddings):
+                self.question_embeddings[question] = embedding
+        
+        embeddings = []
+        for question in questions:
+            self.question_embeddings.move_to_end(question)
+            embeddings.append(self.question_embeddings[question])
+        
+        # Evict only after the lookups so this call's questions are all still present
+        while len(self.question_embeddings) > _QUESTION_CACHE_SIZE:
+            self.question_embeddings.popitem(last=False)
+        
+        if not embeddings:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack(embeddings)
+    
+    def create_question_embedding(self, question: str):
+        """Convert question to embedding (cached, so re-asking skips the API call)"""
+        embeddings = self.create_question_embeddings([question])
+        if embeddings is None:
+            return None
+        return embeddings[0]
     
     def search_documents(self, question: str, top_k: int = 5, company_filter: str = None):
         """Search for most relevant documents"""
@@ -110,52 +189,69 @@ class SimpleRAGSearch:
         if question_embedding is None:
             return []
         
-        all_results = []
+        # Normalize the question once; document rows are normalized at load time
+        query = np.asarray(question_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm > 0:
+            query = query / query_norm
         
-        # Search through all companies (or filtered company)
-        companies_to_search = [company_filter.upper()] if company_filter else self.companies_data.keys()
+        now = (datetime.now() - _EPOCH) // _MICROSECOND
         
-        for company_name in companies_to_search:
-            if company_name not in self.companies_data:
-                continue
-                
-            company_data = self.companies_data[company_name]
-            
-            for doc in company_data['documents']:
-                doc_embedding = doc.get('embedding')
-                if doc_embedding is None:
-                    continue
-                
-                # Calculate similarity
-                similarity = self.cosine_similarity(question_embedding, doc_embedding)
-                
-                # Get content quality score
-                quality_score = doc['metadata'].get('quality_score', 5.0)
-                
-                # Calculate weighted score (similarity + recency + quality)
-                weighted_score, recency_weight, days_ago = self.calculate_weighted_score(
-                    similarity, 
-                    doc['metadata'].get('date', ''), 
-                    quality_score
-                )
-                
-                result = {
-                    'company': company_name,
-                    'similarity': similarity,
-                    'weighted_score': weighted_score,
-                    'recency_weight': recency_weight,
-                    'days_ago': days_ago,
-                    'quality_score': quality_score,
-                    'content': doc['content'],
-                    'metadata': doc['metadata']
-                }
-                
-                all_results.append(result)
+        # Search through all companies (or filtered company): every company is a
+        # contiguous row range of the stacked arrays, so the filter is a slice
+        if company_filter:
+            start, stop = self.company_ranges.get(company_filter.upper(), (0, 0))
+        else:
+            start, stop = 0, len(self.documents)
+        
+        if stop <= start or top_k <= 0:
+            return []
         
-        # Sort by weighted score (highest first)
-        all_results.sort(key=lambda x: x['weighted_score'], reverse=True)
+        # Cosine similarity for every document in one matrix-vector product
+        similarities = (self.search_matrix[start:stop] @ query).astype(np.float64)
         
-        return all_results[:top_k]
+        # Weighted score for every document: 70% similarity + 20% recency + 10% quality,
+        # or the bare similarity for documents not scorable at load
+        scorable = self.scorable[start:stop]
+        days_ago = np.where(scorable, (now - self.doc_times[start:stop]) // _MICROSECONDS_PER_DAY, 0)
+        recency_weights = np.select(
+            [~scorable, days_ago <= 90, days_ago <= 365, days_ago <= 730],
+            [1.0, 1.0, 0.8, 0.6],
+            0.4
+        )
+        weighted_scores = np.where(
+            scorable,
+            (similarities * 0.7) + (recency_weights * 0.2) + (self.quality_weights[start:stop] * 0.1),
+            similarities
+        )
+        
+        # Top-k by weighted score (highest first) without sorting every document: keep
+        # everything tied with the k-th best, then stable-sort just those, so ties stay
+        # in document order as the old full sort left them
+        if top_k < len(weighted_scores):
+            kth_best = weighted_scores[np.argpartition(-weighted_scores, top_k - 1)[top_k - 1]]
+            candidates = np.flatnonzero(weighted_scores >= kth_best)
+        else:
+            candidates = np.arange(len(weighted_scores))
+        top_indices = candidates[np.argsort(-weighted_scores[candidates], kind='stable')][:top_k]
+        
+        # Build result dicts only for the selected documents
+        results = []
+        for i in top_indices.tolist():
+            doc = self.documents[start + i]
+            
+            results.append({
+                'company': self.company_names[self.doc_company_ids[start + i]],
+                'similarity': float(similarities[i]),
+                'weighted_score': float(weighted_scores[i]),
+                'recency_weight': float(recency_weights[i]),
+                'days_ago': int(days_ago[i]),
+                'quality_score': doc['metadata'].get('quality_score', 5.0),
+                'content': doc['content'],
+                'metadata': doc['metadata']
+            })
+        
+        return results
     
     def format_search_results(self, results: List[Dict]):
         """Format search results for display"""
@@ -202,10 +298,11 @@ class SimpleRAGSearch:
         
         return '\n'.join(formatted)
     
-    def generate_answer_with_context(self, question: str, search_results: List[Dict]):
-        """Generate answer using OpenAI with search results as context"""
+    def generate_answer_with_context(self, question: str, search_results: List[Dict], stream: bool = False):
+        """Generate answer using OpenAI with search results as context (text pieces as they arrive if stream)"""
         if not search_results:
-            return "I couldn't find relevant information to answer your question."
+            answer = "I couldn't find relevant information to answer your question."
+            return iter([answer]) if stream else answer
         
         # Prepare context from search results
         context_parts = []
@@ -245,13 +342,18 @@ Instructions:
 
 Answer:"""
 
+        messages = [
+            {"role": "system", "content": "You are a financial analyst expert in earnings call analysis. Provide detailed, accurate responses based on the provided earnings call transcripts."},
+            {"role": "user", "content": prompt}
+        ]
+        
+        if stream:
+            return self._stream_answer(messages)
+        
         try:
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",  # Cost-effective model
-                messages=[
-                    {"role": "system", "content": "You are a financial analyst expert in earnings call analysis. Provide detailed, accurate responses based on the provided earnings call transcripts."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=messages,
                 max_tokens=1000,
                 temperature=0.1  # Low temperature for factual responses
             )
@@ -261,7 +363,25 @@ Answer:"""
         except Exception as e:
             return f"Error generating response: {str(e)}"
     
-    def chat_with_rag(self, question: str, company_filter: str = None):
+    def _stream_answer(self, messages):
+        """Yield the chat completion's text as it is generated"""
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4o-mini",  # Cost-effective model
+                messages=messages,
+                max_tokens=1000,
+                temperature=0.1,  # Low temperature for factual responses
+                stream=True
+            )
+            
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            
+        except Exception as e:
+            yield f"Error generating response: {str(e)}"
+    
+    def chat_with_rag(self, question: str, company_filter: str = None, stream: bool = False):
         """Complete RAG workflow: search + generate answer"""
         print(f"🔍 Searching for: '{question}'")
         
@@ -274,8 +394,8 @@ Answer:"""
         print(f"✅ Found {len(search_results)} relevant sources")
         print("🤖 Generating AI response...\n")
         
-        # Generate answer with context
-        answer = self.generate_answer_with_context(question, search_results)
+        # Generate answer with context (an iterator of text pieces when streaming)
+        answer = self.generate_answer_with_context(question, search_results, stream=stream)
         
         return answer, search_results
 
@@ -337,7 +457,8 @@ def main():
         
         # Get AI response
         try:
-            result = rag.chat_with_rag(question, company_filter=company_filter)
+            # Stream the answer so it prints as soon as the first tokens arrive
+            result = rag.chat_with_rag(question, company_filter=company_filter, stream=True)
             
             if isinstance(result, tuple):
                 answer, sources = result
@@ -345,7 +466,9 @@ def main():
                 # Display AI answer
                 print("🤖 AI Response:")
                 print("-" * 50)
-                print(answer)
+                for piece in answer:
+                    print(piece, end='', flush=True)
+                print()
                 
                 # Optionally show sources
                 if show_sources: